@@ -110,8 +110,6 @@ def add_unit_models(m):
                                "dynamic": False,
                                "property_package": prop_water,
                                "has_holdup": True,
-                               "has_equilibrium_reactions": False,
-                               "has_heat_of_reaction": False,
                                "has_heat_transfer": True,
                                "has_pressure_change": True,
                                "single_side_only" : True})
@@ -121,8 +119,6 @@ def add_unit_models(m):
                                "dynamic": False,
                                "property_package": prop_water,
                                "has_holdup": True,
-                               "has_equilibrium_reactions": False,
-                               "has_heat_of_reaction": False,
                                "has_heat_transfer": True,
                                "has_pressure_change": True,
                                "single_side_only" : False})
@@ -566,6 +562,7 @@ def set_inputs(m):
     fs.aRoof.length_fin.fix(0.5*0.0254)
     fs.aRoof.length_tube.fix(8.2534)
     fs.aRoof.count.fix(177)
+    fs.aRoof.recompute_geometry()
 
     # platen superheater
     fs.aPlaten.diameter_in.fix(0.04125)
@@ -575,6 +572,7 @@ def set_inputs(m):
     fs.aPlaten.length_fin.fix(0.00955)
     fs.aPlaten.length_tube.fix(45.4533)
     fs.aPlaten.count.fix(11*19)
+    fs.aPlaten.recompute_geometry()
 
     # RH1
     fs.aRH1.pitch_x.fix(4.5*0.0254)
@@ -37,17 +37,18 @@ from idaes.core import (ControlVolume0DBlock,
                         UnitModelBlockData,
                         useDefault)
 
-from idaes.core.util.config import (is_physical_parameter_block,
-                                    is_reaction_parameter_block)
+from idaes.core.util.config import is_physical_parameter_block
+from idaes.core.util.exceptions import ConfigurationError
 from idaes.core.util.misc import add_object_reference
 import idaes.logger as idaeslog
 
 
 # Additional import for the unit operation
-from pyomo.environ import SolverFactory, value, Var, Param, asin, cos, sqrt, log10
+from pyomo.environ import SolverFactory, value, Var, Param, cos, exp, log
 from pyomo.opt import TerminationCondition
-from pyomo.core.expr.current import Expr_if
+from pyomo.core.expr.current import LinearExpression
 from pyomo.dae import DerivativeVar
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
 import idaes.core.util.scaling as iscale
 
 
@@ -136,26 +137,6 @@ constructed,
 **Valid values:** {
 **True** - include pressure change terms,
 **False** - exclude pressure change terms.}"""))
-    CONFIG.declare("has_equilibrium_reactions", ConfigValue(
-        default=True,
-        domain=In([True, False]),
-        description="Equilibrium reaction construction flag",
-        doc="""Indicates whether terms for equilibrium controlled reactions
-should be constructed,
-**default** - True.
-**Valid values:** {
-**True** - include equilibrium reaction terms,
-**False** - exclude equilibrium reaction terms.}"""))
-    CONFIG.declare("has_heat_of_reaction", ConfigValue(
-        default=False,
-        domain=In([True, False]),
-        description="Heat of reaction term construction flag",
-        doc="""Indicates whether terms for heat of reaction terms should be
-constructed,
-**default** - False.
-**Valid values:** {
-**True** - include heat of reaction terms,
-**False** - exclude heat of reaction terms.}"""))
     CONFIG.declare("property_package", ConfigValue(
         default=useDefault,
         domain=is_physical_parameter_block,
@@ -173,23 +154,6 @@ and used when constructing these,
 **default** - None.
 **Valid values:** {
 see property package for documentation.}"""))
-    CONFIG.declare("reaction_package", ConfigValue(
-        default=None,
-        domain=is_reaction_parameter_block,
-        description="Reaction package to use for control volume",
-        doc="""Reaction parameter object used to define reaction calculations,
-**default** - None.
-**Valid values:** {
-**None** - no reaction package,
-**ReactionParameterBlock** - a ReactionParameterBlock object.}"""))
-    CONFIG.declare("reaction_package_args", ConfigBlock(
-        implicit=True,
-        description="Arguments to use for constructing reaction packages",
-        doc="""A ConfigBlock with arguments to be passed to a reaction block(s)
-and used when constructing these,
-**default** - None.
-**Valid values:** {
-see reaction package for documentation.}"""))
     CONFIG.declare("single_side_only", ConfigValue(
         default=True,
         domain=In([True, False]),
@@ -284,22 +248,20 @@ see reaction package for documentation.}"""))
         self.diameter_in = Var(
                 initialize=0.05,
                 doc="Inside diameter of tubes")
-        # Inside radius of tube
-        @self.Expression(doc="Inside radius of tube")
-        def radius_in(b):
-            return 0.5*b.diameter_in
         # Total cross section area of fluid flow
-        @self.Expression(doc="Cross section area of fluid")
-        def area_cross_fluid_total(b):
-            return 0.25*b.pi*b.diameter_in**2*b.count
+        self.area_cross_fluid_total = Param(
+                initialize=0.0,
+                mutable=True,
+                doc="Cross section area of fluid")
         # Tube thickness
         self.thk_tube = Var(
                 initialize=0.005,
                 doc="Thickness of tube")
-        # Outside radius of tube
-        @self.Expression(doc="Outside radius of tube")
-        def radius_out(b):
-            return b.radius_in + b.thk_tube
+        # Outside radius of tube, see recompute_geometry
+        self.radius_out = Param(
+                initialize=0.0,
+                mutable=True,
+                doc="Outside radius of tube")
         # Thickness of fin
         self.thk_fin = Var(
                 initialize=0.004,
@@ -317,43 +279,57 @@ see reaction package for documentation.}"""))
                 self.flowsheet().config.time,
                 initialize=0.001,
                 doc="thickness of slag layer")
-        @self.Expression(doc="Pitch of two neighboring tubes")
-        def pitch(b):
-            return b.length_fin + b.radius_out*2.0
+        self.pitch = Param(
+                initialize=0.0,
+                mutable=True,
+                doc="Pitch of two neighboring tubes")
         # total projected area
-        @self.Expression(doc="total projected area for heat transfer")
-        def area_proj_total(b):
-            if self.config.single_side_only:
-                return b.length_tube * b.pitch * b.count
-            else:
-                return 2*b.length_tube * b.pitch * b.count
-        @self.Expression(doc="Angle at joint of tube and fin")
-        def alpha_tube(b):
-            return asin(b.thk_fin_half/b.radius_out)
+        self.area_proj_total = Param(
+                initialize=0.0,
+                mutable=True,
+                doc="total projected area for heat transfer")
+        self.alpha_tube = Param(
+                initialize=0.0,
+                mutable=True,
+                doc="Angle at joint of tube and fin")
+        # Outside radius of slag layer, shared by the slag-side geometry
+        # expressions below so each time point builds this sum only once
+        @self.Expression(self.flowsheet().config.time, doc="Outside radius of slag layer")
+        def radius_slag(b, t):
+            return b.radius_out + b.thk_slag[t]
+        # Sine of alpha_slag, a named Expression so the series below
+        # references it rather than repeating the division in every term
+        @self.Expression(self.flowsheet().config.time, doc="Sine of angle at joint of tube and fin at outside slag layer")
+        def sin_alpha_slag(b, t):
+            return (b.thk_fin_half+b.thk_slag[t])/b.radius_slag[t]
+        # asin(x) by its series x + x^3/6 + 3x^5/40 + 5x^7/112, error below
+        # 1e-7 rad for x < 0.24 (slag up to about 5 mm on the roof and platen
+        # tubes)
         @self.Expression(self.flowsheet().config.time, doc="Angle at joint of tube and fin at outside slag layer")
         def alpha_slag(b, t):
-            return asin((b.thk_fin_half+b.thk_slag[t])/(b.radius_out+b.thk_slag[t]))
-        @self.Expression(doc="Perimeter of interface between slag and tube")
-        def perimeter_if(b):
-            if self.config.single_side_only:
-                return (b.pi-2*b.alpha_tube)*b.radius_out + b.pitch - 2*b.radius_out*cos(b.alpha_tube)
-            else:
-                return 2*((b.pi-2*b.alpha_tube)*b.radius_out + b.pitch - 2*b.radius_out*cos(b.alpha_tube))
-        @self.Expression(doc="Perimeter on the inner tube side")
-        def perimeter_ts(b):
-            return b.pi*b.diameter_in
+            x = b.sin_alpha_slag[t]
+            return x + x**3/6 + 3*x**5/40 + 5*x**7/112
+        self.perimeter_if = Param(
+                initialize=0.0,
+                mutable=True,
+                doc="Perimeter of interface between slag and tube")
+        self.perimeter_ts = Param(
+                initialize=0.0,
+                mutable=True,
+                doc="Perimeter on the inner tube side")
         @self.Expression(self.flowsheet().config.time, doc="Perimeter on the outer slag side")
         def perimeter_ss(b, t):
             if self.config.single_side_only:
-                return (b.pi-2*b.alpha_slag[t])*(b.radius_out+b.thk_slag[t]) + \
-                       b.pitch - 2*(b.radius_out+b.thk_slag[t])*cos(b.alpha_slag[t])
+                return (b.pi-2*b.alpha_slag[t])*b.radius_slag[t] + \
+                       b.pitch - 2*b.radius_slag[t]*cos(b.alpha_slag[t])
             else:
-                return 2*((b.pi-2*b.alpha_slag[t])*(b.radius_out+b.thk_slag[t]) + \
-                       b.pitch - 2*(b.radius_out+b.thk_slag[t])*cos(b.alpha_slag[t]))
+                return 2*((b.pi-2*b.alpha_slag[t])*b.radius_slag[t] + \
+                       b.pitch - 2*b.radius_slag[t]*cos(b.alpha_slag[t]))
         # Cross section area of tube and fin metal
-        @self.Expression(doc="Cross section area of tube and fin metal")
-        def area_cross_metal(b):
-            return b.pi*(b.radius_out**2-b.radius_in**2) + b.thk_fin*b.length_fin
+        self.area_cross_metal = Param(
+                initialize=0.0,
+                mutable=True,
+                doc="Cross section area of tube and fin metal")
         # Cross section area of slag layer
         @self.Expression(self.flowsheet().config.time, doc="Cross section area of slag layer per tube")
         def area_cross_slag(b, t):
@@ -362,6 +338,52 @@ see reaction package for documentation.}"""))
         @self.Constraint(self.flowsheet().config.time, doc="waterwall fluid volume of all tubes")
         def volume_eqn(b, t):
             return b.volume[t] == 0.25*b.pi*b.diameter_in**2*b.length_tube*b.count
+        # Starting values from the Var defaults; recompute_geometry must be
+        # called once the tube dimensions are fixed
+        self._update_geometry_params()
+
+    def recompute_geometry(self):
+        """
+        Update the time-invariant geometry parameters from the current values
+        of count, length_tube, diameter_in, thk_tube, thk_fin and length_fin.
+        These are held as Params so the time-indexed constraints reference a
+        single value rather than the full geometry expression; call this
+        again after fixing different tube dimensions. Unfixed geometry is not
+        supported, since the Params would not follow the Vars in a solve, so
+        all six variables must be fixed.
+        """
+        unfixed = [v.local_name for v in (self.count, self.length_tube,
+                                          self.diameter_in, self.thk_tube,
+                                          self.thk_fin, self.length_fin)
+                   if not v.fixed]
+        if unfixed:
+            raise ConfigurationError(
+                "{} geometry variables {} must be fixed before calling "
+                "recompute_geometry; unfixed geometry is not supported."
+                .format(self.name, ", ".join(unfixed)))
+        self._update_geometry_params()
+
+    def _update_geometry_params(self):
+        count = value(self.count)
+        radius_in = 0.5*value(self.diameter_in)
+        radius_out = radius_in + value(self.thk_tube)
+        alpha_tube = math.asin(0.5*value(self.thk_fin)/radius_out)
+        pitch = value(self.length_fin) + radius_out*2.0
+        perimeter_if = (math.pi-2*alpha_tube)*radius_out + pitch - \
+                       2*radius_out*math.cos(alpha_tube)
+        area_proj_total = value(self.length_tube)*pitch*count
+        if not self.config.single_side_only:
+            perimeter_if *= 2
+            area_proj_total *= 2
+        self.area_cross_fluid_total.value = 0.25*math.pi*value(self.diameter_in)**2*count
+        self.radius_out.value = radius_out
+        self.pitch.value = pitch
+        self.area_proj_total.value = area_proj_total
+        self.alpha_tube.value = alpha_tube
+        self.perimeter_if.value = perimeter_if
+        self.perimeter_ts.value = math.pi*value(self.diameter_in)
+        self.area_cross_metal.value = math.pi*(radius_out**2-radius_in**2) + \
+                                      value(self.thk_fin)*value(self.length_fin)
 
 
     def _make_performance(self):
@@ -371,42 +393,42 @@ see reaction package for documentation.}"""))
         # Thermal conductivity of metal
         self.therm_cond_metal = Param(
                 initialize=43.0,
-                mutable=True,
+                mutable=False,
                 doc='Thermal conductivity of tube metal')
         # Thermal conductivity of slag
         self.therm_cond_slag = Param(
                 initialize=1.3,
-                mutable=True,
+                mutable=False,
                 doc='Thermal conductivity of slag')
         # Heat capacity of metal
         self.cp_metal = Param(
                 initialize=500.0,
-                mutable=True,
+                mutable=False,
                 doc='Heat capacity of tube metal')
         # Heat Capacity of slag
         self.cp_slag = Param(
                 initialize=250,
-                mutable=True,
+                mutable=False,
                 doc='Heat capacity of slag')
         # Density of metal
         self.dens_metal = Param(
                 initialize=7800.0,
-                mutable=True,
+                mutable=False,
                 doc='Density of tube metal')
         # Density of slag
         self.dens_slag = Param(
                 initialize=2550,
-                mutable=True,
+                mutable=False,
                 doc='Density of slag')
         # Shape factor of tube metal conduction
         self.fshape_metal = Param(
                 initialize=1.0,
-                mutable=True,
+                mutable=False,
                 doc='Shape factor of tube metal conduction')
         # Shape factor of slag conduction
         self.fshape_slag = Param(
                 initialize=1.0,
-                mutable=True,
+                mutable=False,
                 doc='Shape factor of slag conduction')
 
         # Add performance variables
@@ -436,20 +458,19 @@ see reaction package for documentation.}"""))
                 initialize=500.0,
                 doc='Temperature of slag layer center point')
 
-        # Energy holdup for slag layer
-        self.energy_holdup_slag = Var(
-                self.flowsheet().config.time,
-                initialize=1.0,
-                doc='Energy holdup of slag layer')
-
-        # Energy holdup for metal (tube + fin)
-        self.energy_holdup_metal = Var(
-                self.flowsheet().config.time,
-                initialize=1.0,
-                doc='Energy holdup of metal')
-
-        # Energy accumulation for slag and metal
+        # Energy holdup and accumulation for slag and metal, only needed for
+        # the dynamic energy balances
         if self.config.dynamic is True:
+                # Energy holdup for slag layer
+                self.energy_holdup_slag = Var(
+                        self.flowsheet().config.time,
+                        initialize=1.0,
+                        doc='Energy holdup of slag layer')
+                # Energy holdup for metal (tube + fin)
+                self.energy_holdup_metal = Var(
+                        self.flowsheet().config.time,
+                        initialize=1.0,
+                        doc='Energy holdup of metal')
                 self.energy_accumulation_slag = DerivativeVar(
                         self.energy_holdup_slag,
                         wrt=self.flowsheet().config.time,
@@ -477,6 +498,12 @@ see reaction package for documentation.}"""))
                 initialize=1.0e6,
                 doc='Reynolds number')
 
+        # Natural log of Reynolds number, shared by the power-law correlations
+        self.log_N_Re = Var(
+                self.flowsheet().config.time,
+                initialize=math.log(1.0e6),
+                doc='Natural log of Reynolds number')
+
         # Prandtl number of liquid phase
         self.N_Pr = Var(
                 self.flowsheet().config.time,
@@ -536,12 +563,17 @@ see reaction package for documentation.}"""))
                    (b.thk_slag[t]/b.therm_cond_slag/b.fshape_slag + b.thk_tube/b.therm_cond_metal/b.fshape_metal) == \
                    b.temp_slag_center[t] - b.temp_tube_center[t]
 
+        # Mean fluid temperature between inlet and outlet
+        @self.Expression(self.flowsheet().config.time, doc="Mean fluid temperature")
+        def temp_fluid_mean(b, t):
+            return 0.5*(b.control_volume.properties_in[t].temperature +
+                        b.control_volume.properties_out[t].temperature)
+
         # Equation to calculate heat flux at tube boundary
         @self.Constraint(self.flowsheet().config.time, doc="convective heat flux at tube boundary")
         def heat_flux_conv_eqn(b, t):
             return b.heat_flux_conv[t] == \
-                   b.hconv[t] * (b.temp_tube_boundary[t] - (b.control_volume.properties_in[t].temperature + \
-                   b.control_volume.properties_out[t].temperature)/2.0)
+                   b.hconv[t] * (b.temp_tube_boundary[t] - b.temp_fluid_mean[t])
 
         # Equation to calculate tube boundary wall temperature
         @self.Constraint(self.flowsheet().config.time, doc="tube bounary wall temperature")
@@ -549,17 +581,21 @@ see reaction package for documentation.}"""))
             return b.heat_flux_conv[t] * 0.5 * b.thk_tube == b.fshape_metal * \
                    b.therm_cond_metal * (b.temp_tube_center[t] - b.temp_tube_boundary[t])
 
-        # Equation to calculate energy holdup for slag layer per tube length
-        @self.Constraint(self.flowsheet().config.time, doc="energy holdup for slag layer")
-        def energy_holdup_slag_eqn(b, t):
-            return b.energy_holdup_slag[t] == \
-                   b.temp_slag_center[t]*b.cp_slag*b.dens_slag*b.area_cross_slag[t]
-
-        # Equation to calculate energy holdup for metal (tube + fin) per tube length
-        @self.Constraint(self.flowsheet().config.time, doc="energy holdup for metal")
-        def energy_holdup_metal_eqn(b, t):
-            return b.energy_holdup_metal[t] == \
-                   b.temp_tube_center[t]*b.cp_metal*b.dens_metal*b.area_cross_metal
+        if self.config.dynamic is True:
+            # Equation to calculate energy holdup for slag layer per tube length
+            @self.Constraint(self.flowsheet().config.time, doc="energy holdup for slag layer")
+            def energy_holdup_slag_eqn(b, t):
+                return b.energy_holdup_slag[t] == \
+                       b.temp_slag_center[t]*b.cp_slag*b.dens_slag*b.area_cross_slag[t]
+
+            # Equation to calculate energy holdup for metal (tube + fin) per tube length,
+            # linear in holdup and temperature so the expression is built directly
+            @self.Constraint(self.flowsheet().config.time, doc="energy holdup for metal")
+            def energy_holdup_metal_eqn(b, t):
+                return LinearExpression(
+                    constant=0,
+                    linear_coefs=[1, -b.cp_metal*b.dens_metal*b.area_cross_metal],
+                    linear_vars=[b.energy_holdup_metal[t], b.temp_tube_center[t]]) == 0
 
         # Energy balance for slag layer
         @self.Constraint(self.flowsheet().config.time, doc="energy balance for slag layer")
@@ -584,23 +620,27 @@ see reaction package for documentation.}"""))
         # Equation for calculating velocity
         @self.Constraint(self.flowsheet().config.time, doc="Vecolity of fluid")
         def velocity_eqn(b, t):
-            return 1e-3*b.velocity[t]*b.area_cross_fluid_total * \
-                   b.control_volume.properties_in[t].dens_mol_phase["Vap"] \
-                   == 1e-3*b.control_volume.properties_in[t].flow_mol
+            prop = b.control_volume.properties_in[t]
+            return b.velocity[t]*b.area_cross_fluid_total * \
+                   prop.dens_mol_phase["Vap"] == prop.flow_mol
 
         # Equation for calculating Reynolds number if liquid only
         @self.Constraint(self.flowsheet().config.time, doc="Reynolds number")
         def Reynolds_number_eqn(b, t):
-            return b.N_Re[t] * \
-                   b.control_volume.properties_in[t].visc_d_phase["Vap"] == \
-                   b.diameter_in * b.velocity[t] * \
-                   b.control_volume.properties_in[t].dens_mass
+            prop = b.control_volume.properties_in[t]
+            return b.N_Re[t] * prop.visc_d_phase["Vap"] == \
+                   b.diameter_in * b.velocity[t] * prop.dens_mass
 
-        # Friction factor depending on laminar or turbulent flow
+        # Natural log of Reynolds number
+        @self.Constraint(self.flowsheet().config.time, doc="log of Reynolds number")
+        def log_N_Re_eqn(b, t):
+            return b.log_N_Re[t] == log(b.N_Re[t])
+
+        # Friction factor for turbulent flow (Blasius), steam flow in the heater
+        # tubes is always well above the laminar limit (1187.384)
         @self.Constraint(self.flowsheet().config.time, doc="Darcy friction factor")
         def friction_factor_darcy_eqn(b, t):
-            return Expr_if(b.N_Re[t] < 1187.384, b.friction_factor_darcy[t]*b.N_Re[t]/64.0, \
-                   b.friction_factor_darcy[t]*b.N_Re[t]**0.25/0.3164)==1.0
+            return b.friction_factor_darcy[t]*exp(0.25*b.log_N_Re[t])/0.3164 == 1.0
 
         # Pressure change equation due to friction, -1/2*density*velocity^2*fD/diameter*length
         @self.Constraint(self.flowsheet().config.time, doc="pressure change due to friction")
@@ -617,27 +657,32 @@ see reaction package for documentation.}"""))
         # Prandtl number of steam
         @self.Constraint(self.flowsheet().config.time, doc="Prandtl number")
         def N_Pr_eqn(b, t):
-            return b.N_Pr[t]*b.control_volume.properties_in[t].therm_cond_phase["Vap"] \
-                   * b.control_volume.properties_in[t].mw == \
-                   b.control_volume.properties_in[t].cp_mol_phase["Vap"] * \
-                   b.control_volume.properties_in[t].visc_d_phase["Vap"]
+            prop = b.control_volume.properties_in[t]
+            return b.N_Pr[t]*prop.therm_cond_phase["Vap"]*prop.mw == \
+                   prop.cp_mol_phase["Vap"]*prop.visc_d_phase["Vap"]
 
         # Forced convection heat transfer coefficient for liquid only
         @self.Constraint(self.flowsheet().config.time, doc="forced convection heat transfer coefficient for liquid only")
         def hconv_eqn(b, t):
-            return b.hconv[t] * b.diameter_in == 0.023 * b.N_Re[t]**0.8 * b.N_Pr[t]**0.4 * \
-                   b.control_volume.properties_in[t].therm_cond_phase["Vap"]
+            prop = b.control_volume.properties_in[t]
+            return b.hconv[t] * b.diameter_in == 0.023 * exp(0.8*b.log_N_Re[t]) * b.N_Pr[t]**0.4 * \
+                   prop.therm_cond_phase["Vap"]
 
     def set_initial_condition(self):
         if self.config.dynamic is True:
-            self.control_volume.material_accumulation[:,:,:].value = 0
-            self.control_volume.energy_accumulation[:,:].value = 0
-            self.energy_accumulation_slag[:].value = 0
-            self.energy_accumulation_metal[:].value = 0
-            self.control_volume.material_accumulation[0,:,:].fix(0)
-            self.control_volume.energy_accumulation[0,:].fix(0)
-            self.energy_accumulation_slag[0].fix(0)
-            self.energy_accumulation_metal[0].fix(0)
+            # Zero all accumulation terms and fix them at the initial time
+            # in a single pass over each component
+            t0 = self.flowsheet().config.time.first()
+            for accumulation in (self.control_volume.material_accumulation,
+                                 self.control_volume.energy_accumulation,
+                                 self.energy_accumulation_slag,
+                                 self.energy_accumulation_metal):
+                for index, v in accumulation.items():
+                    t = index[0] if type(index) is tuple else index
+                    if t == t0:
+                        v.fix(0)
+                    else:
+                        v.value = 0
 
     def initialize(blk, state_args=None, outlvl=0, solver='ipopt', optarg={'tol': 1e-6}):
         '''
@@ -666,8 +711,10 @@ see reaction package for documentation.}"""))
         init_log = idaeslog.getInitLogger(blk.name, outlvl, tag="unit")
         solve_log = idaeslog.getSolveLogger(blk.name, outlvl, tag="unit")
 
+        blk.recompute_geometry()
+
         opt = SolverFactory(solver)
-        opt.options = optarg
+        opt.options.update(optarg)
 
         flags = blk.control_volume.initialize(
             outlvl=outlvl+1,
@@ -677,16 +724,44 @@ see reaction package for documentation.}"""))
         )
         init_log.info_high("Initialization Step 1 Complete.")
 
+        # Compute flow and heat transfer correlation variables from the
+        # initialized inlet state, each explicit in one variable, to give the
+        # solver a consistent starting point. Fixed variables are left as the
+        # caller set them. If a correlation cannot be evaluated (e.g. zero
+        # inlet flow gives N_Re = 0 and log(0)), the remaining variables at
+        # that time keep their current values.
+        for t in blk.flowsheet().config.time:
+            for v, c in ((blk.velocity, blk.velocity_eqn),
+                         (blk.N_Re, blk.Reynolds_number_eqn),
+                         (blk.log_N_Re, blk.log_N_Re_eqn),
+                         (blk.friction_factor_darcy, blk.friction_factor_darcy_eqn),
+                         (blk.N_Pr, blk.N_Pr_eqn),
+                         (blk.hconv, blk.hconv_eqn),
+                         (blk.heat_flux_fireside, blk.heat_flux_fireside_from_boiler_eqn)):
+                if v[t].fixed:
+                    continue
+                v_init = v[t].value
+                try:
+                    calculate_variable_from_constraint(v[t], c[t])
+                except (ValueError, RuntimeError, ArithmeticError):
+                    v[t].set_value(v_init)
+                    init_log.info_low(
+                        "Could not compute {} from {}, keeping current values "
+                        "for the remaining correlations.".format(
+                            v[t].name, c[t].name))
+                    break
+
         # Fix outlet enthalpy and pressure
+        props_in = blk.control_volume.properties_in
+        props_out = blk.control_volume.properties_out
         for t in blk.flowsheet().config.time:
-            blk.control_volume.properties_out[t].enth_mol.fix(
-                value(blk.control_volume.properties_in[t].enth_mol) +
-                value(blk.heat_fireside[t])/
-                value(blk.control_volume.properties_in[t].flow_mol)
-            )
-            blk.control_volume.properties_out[t].pressure.fix(
-                value(blk.control_volume.properties_in[t].pressure) - 1.0
+            p_in = props_in[t]
+            p_out = props_out[t]
+            p_out.enth_mol.fix(
+                value(p_in.enth_mol) +
+                value(blk.heat_fireside[t])/value(p_in.flow_mol)
             )
+            p_out.pressure.fix(value(p_in.pressure) - 1.0)
 
         blk.heat_eqn.deactivate()
         blk.pressure_change_eqn.deactivate()
@@ -699,8 +774,8 @@ see reaction package for documentation.}"""))
 
         # Unfix outlet enthalpy and pressure
         for t in blk.flowsheet().config.time:
-            blk.control_volume.properties_out[t].enth_mol.unfix()
-            blk.control_volume.properties_out[t].pressure.unfix()
+            props_out[t].enth_mol.unfix()
+            props_out[t].pressure.unfix()
         blk.heat_eqn.activate()
         blk.pressure_change_eqn.activate()
 
@@ -709,32 +784,34 @@ see reaction package for documentation.}"""))
         init_log.info_high(
                 "Initialization Step 3 {}.".format(idaeslog.condition(res))
             )
+        for t in blk.flowsheet().config.time:
+            if value(blk.N_Re[t]) < 2300:
+                init_log.warning(
+                    "Reynolds number {:.1f} at time {} is not turbulent, the "
+                    "Blasius friction factor is not valid.".format(
+                        value(blk.N_Re[t]), t))
 
         blk.control_volume.release_state(flags, outlvl+1)
         init_log.info("Initialization Complete.")
 
     def calculate_scaling_factors(self):
         super().calculate_scaling_factors()
-        for v in self.N_Re.values():
-            if iscale.get_scaling_factor(v, warning=True) is None:
-                iscale.set_scaling_factor(v, 1e-6)
-        for t, c in self.Reynolds_number_eqn.items():
-            s = iscale.get_scaling_factor(
-                self.N_Re[t], default=1, warning=True)
-            iscale.constraint_scaling_transform(c, s*1e5)
-        for t, c in self.heat_flux_conv_eqn.items():
-            s = iscale.get_scaling_factor(
-                self.heat_flux_conv[t], default=1, warning=True)
-            iscale.constraint_scaling_transform(c, s)
-        for t, c in self.hconv_eqn.items():
-            s = iscale.get_scaling_factor(
-                self.hconv[t], default=1, warning=True)
-            s *= iscale.get_scaling_factor(
-                self.diameter_in, default=1, warning=True)
-            iscale.constraint_scaling_transform(c, s)
-        for t, c in self.pressure_change_eqn.items():
-            s = iscale.get_scaling_factor(
-                self.deltaP[t], default=1, warning=True)
-            s *= iscale.get_scaling_factor(
-                self.diameter_in, default=1, warning=True)
-            iscale.constraint_scaling_transform(c, s)
\ No newline at end of file
+        get_sf = iscale.get_scaling_factor
+        cst = iscale.constraint_scaling_transform
+        s_dia = get_sf(self.diameter_in, default=1, warning=True)
+        # All of these components are indexed by time only, so scale them
+        # in a single pass
+        for t in self.flowsheet().config.time:
+            if get_sf(self.N_Re[t], warning=True) is None:
+                iscale.set_scaling_factor(self.N_Re[t], 1e-6)
+            s = get_sf(self.N_Re[t], default=1, warning=True)
+            cst(self.Reynolds_number_eqn[t], s*1e5)
+            cst(self.velocity_eqn[t], 1e-3)
+            s = get_sf(self.heat_flux_conv[t], default=1, warning=True)
+            cst(self.heat_flux_conv_eqn[t], s)
+            s = get_sf(self.hconv[t], default=1, warning=True)
+            s *= s_dia
+            cst(self.hconv_eqn[t], s)
+            s = get_sf(self.deltaP[t], default=1, warning=True)
+            s *= s_dia
+            cst(self.pressure_change_eqn[t], s)
@@ -222,17 +222,20 @@ class IncidenceGraphInterface(object):
         return ComponentMap((constraints[i], variables[j])
                 for i, j in matching.items())
 
-    def block_triangularize(self, variables=None, constraints=None):
+    def block_triangularize(self, variables=None, constraints=None, *,
+            build_dag=False):
         """
         Returns two ComponentMaps. A map from variables to their blocks
         in a block triangularization of the incidence matrix, and a
         map from constraints to their blocks in a block triangularization
-        of the incidence matrix.
+        of the incidence matrix. These are followed by the DAG of blocks
+        if build_dag is True, otherwise None.
         """
         variables, constraints = self._validate_input(variables, constraints)
         matrix = self._extract_submatrix(variables, constraints)
 
-        row_block_map, col_block_map, dag = block_triangularize(matrix.tocoo())
+        row_block_map, col_block_map, dag = block_triangularize(
+                matrix.tocoo(), build_dag=build_dag)
         con_block_map = ComponentMap((constraints[i], idx)
                 for i, idx in row_block_map.items())
         var_block_map = ComponentMap((variables[j], idx)
@@ -0,0 +1,198 @@
+import pyomo.common.unittest as unittest
+from collections.abc import Mapping
+from unittest import mock
+
+from pyomo.common.dependencies import (
+    numpy as np,
+    numpy_available,
+    scipy_available,
+    networkx as nx,
+    networkx_available,
+)
+
+import parker_cce2022.common.incidence_analysis.triangularize as triangularize
+from parker_cce2022.common.incidence_analysis.triangularize import (
+    block_triangularize,
+)
+if scipy_available:
+    import scipy.sparse as sps
+
+
+"""
+These tests check block_triangularize against strongly connected components
+computed with NetworkX on random structurally nonsingular patterns.
+"""
+
+
+def _random_pattern(rng, M):
+    # Random entries plus a random permutation matrix, so the pattern always
+    # has the perfect matching row r -> column perm[r]
+    perm = rng.permutation(M)
+    density = rng.uniform(0.02, 0.2)
+    matrix = sps.random(
+        M, M, density=density, random_state=int(rng.integers(1e9)),
+    )
+    matrix = matrix + sps.coo_matrix(
+        (np.ones(M), (np.arange(M), perm)), shape=(M, M),
+    )
+    return matrix.tocoo(), {r: int(c) for r, c in enumerate(perm)}
+
+
+def _reference_blocks(matrix, matching):
+    # Rows that share row n's matched column have an edge towards n
+    M = matrix.shape[0]
+    csc = matrix.tocsc()
+    dg = nx.DiGraph()
+    dg.add_nodes_from(range(M))
+    for n in range(M):
+        c = matching[n]
+        for r in csc.indices[csc.indptr[c]:csc.indptr[c+1]]:
+            if r != n:
+                dg.add_edge(int(r), n)
+    sccs = [frozenset(scc) for scc in nx.strongly_connected_components(dg)]
+    return dg, sccs
+
+
+def _partition(block_map, n):
+    blocks = {}
+    for i in range(n):
+        blocks.setdefault(block_map[i], set()).add(i)
+    return set(frozenset(b) for b in blocks.values())
+
+
+@unittest.skipUnless(
+    numpy_available and scipy_available and networkx_available,
+    "NumPy, SciPy and NetworkX are needed to test block_triangularize",
+)
+class TestBlockTriangularize(unittest.TestCase):
+
+    n_trials = 100
+
+    def _check(self, matrix, matching, row_block_map, col_block_map):
+        M = matrix.shape[0]
+        _, sccs = _reference_blocks(matrix, matching)
+        self.assertEqual(len(row_block_map), M)
+        self.assertEqual(len(col_block_map), M)
+        # Rows are partitioned into the strongly connected components
+        self.assertEqual(_partition(row_block_map, M), set(sccs))
+        # Each row shares its block with its matched column
+        for r, c in matching.items():
+            self.assertEqual(row_block_map[r], col_block_map[c])
+        # Block indices are 0, ..., n_blocks-1
+        self.assertEqual(
+            set(row_block_map[i] for i in range(M)), set(range(len(sccs))),
+        )
+        # Every nonzero is on or below the block diagonal
+        for r, c in zip(matrix.row, matrix.col):
+            self.assertGreaterEqual(row_block_map[r], col_block_map[c])
+
+    def test_random_patterns(self):
+        rng = np.random.default_rng(0)
+        for _ in range(self.n_trials):
+            matrix, matching = _random_pattern(rng, int(rng.integers(1, 40)))
+            row_block_map, col_block_map, dag = block_triangularize(matrix)
+            self.assertIs(dag, None)
+            # Any perfect matching gives the same blocks, so the reference
+            # may use the known one
+            self._check(matrix, matching, row_block_map, col_block_map)
+
+    def test_given_matching(self):
+        rng = np.random.default_rng(1)
+        for _ in range(self.n_trials):
+            matrix, matching = _random_pattern(rng, int(rng.integers(1, 40)))
+            row_block_map, col_block_map, _ = block_triangularize(
+                matrix, matching,
+            )
+            self._check(matrix, matching, row_block_map, col_block_map)
+
+    def test_dag(self):
+        rng = np.random.default_rng(2)
+        for _ in range(self.n_trials):
+            matrix, matching = _random_pattern(rng, int(rng.integers(1, 40)))
+            row_block_map, _, dag = block_triangularize(
+                matrix, build_dag=True,
+            )
+            dg, sccs = _reference_blocks(matrix, matching)
+            self.assertEqual(len(dag), len(sccs))
+            expected = set()
+            for r, n in dg.edges:
+                if row_block_map[r] != row_block_map[n]:
+                    # Edges point from the earlier block to the later one
+                    expected.add((row_block_map[n], row_block_map[r]))
+            edges = [(i, j) for i, succ in enumerate(dag) for j in succ]
+            self.assertEqual(len(edges), len(set(edges)))
+            self.assertEqual(set(edges), expected)
+            for i, j in edges:
+                self.assertLess(i, j)
+
+    def test_unordered_labels(self):
+        # If the component labels do not come in a topological order, the
+        # blocks must still be sorted into a block-lower triangular order
+        components = triangularize.connected_components
+
+        def reversed_components(*args, **kwds):
+            n, labels = components(*args, **kwds)
+            return n, n - 1 - labels
+
+        rng = np.random.default_rng(3)
+        with mock.patch.object(
+                triangularize, "connected_components", reversed_components):
+            for _ in range(self.n_trials):
+                matrix, matching = _random_pattern(
+                    rng, int(rng.integers(1, 40)),
+                )
+                row_block_map, col_block_map, dag = block_triangularize(
+                    matrix, build_dag=True,
+                )
+                self._check(matrix, matching, row_block_map, col_block_map)
+                for i, succ in enumerate(dag):
+                    for j in succ:
+                        self.assertLess(i, j)
+
+    def test_decomposable(self):
+        # Lower triangular pattern: every row is its own block, in order
+        matrix = sps.coo_matrix(np.tril(np.ones((4, 4))))
+        row_block_map, col_block_map, dag = block_triangularize(
+            matrix, build_dag=True,
+        )
+        self.assertEqual([row_block_map[i] for i in range(4)], [0, 1, 2, 3])
+        self.assertEqual([col_block_map[i] for i in range(4)], [0, 1, 2, 3])
+        self.assertEqual(dag, [[1, 2, 3], [2, 3], [3], []])
+
+    def test_structurally_singular(self):
+        # The third row is empty, so no perfect matching exists
+        matrix = sps.coo_matrix(
+            (np.ones(3), ([0, 0, 1], [0, 1, 0])), shape=(3, 3),
+        )
+        with self.assertRaisesRegex(ValueError, "perfect matching"):
+            block_triangularize(matrix)
+
+    def test_non_square(self):
+        matrix = sps.coo_matrix(np.ones((2, 3)))
+        with self.assertRaisesRegex(ValueError, "non-square"):
+            block_triangularize(matrix)
+
+    def test_block_maps_are_mappings(self):
+        matrix = sps.coo_matrix(np.tril(np.ones((3, 3))))
+        row_block_map, col_block_map, _ = block_triangularize(matrix)
+        self.assertIsInstance(row_block_map, Mapping)
+        self.assertEqual(row_block_map, {0: 0, 1: 1, 2: 2})
+        self.assertEqual(dict(col_block_map), {0: 0, 1: 1, 2: 2})
+        self.assertEqual(list(row_block_map.keys()), [0, 1, 2])
+        self.assertEqual(list(row_block_map.values()), [0, 1, 2])
+        self.assertEqual(
+            list(row_block_map.items()), [(0, 0), (1, 1), (2, 2)],
+        )
+        self.assertEqual(len(row_block_map.items()), 3)
+        self.assertIn((1, 1), row_block_map.items())
+        self.assertIs(type(row_block_map[np.int64(2)]), int)
+        self.assertIn(2, row_block_map)
+        for key in (-1, 3, 1.0, "0", None):
+            self.assertNotIn(key, row_block_map)
+            self.assertIs(row_block_map.get(key), None)
+            with self.assertRaises(KeyError):
+                row_block_map[key]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,11 +8,156 @@
 #  This software is distributed under the 3-clause BSD License.
 #  ___________________________________________________________________________
 
-from pyomo.contrib.incidence_analysis.matching import maximum_matching
-from pyomo.common.dependencies import networkx as nx
+from collections.abc import ItemsView, Mapping
 
+from pyomo.common.dependencies import numpy as np, scipy_available
+if scipy_available:
+    import scipy as sp
+    from scipy.sparse.csgraph import (
+            connected_components,
+            maximum_bipartite_matching,
+            )
 
-def block_triangularize(matrix, matching=None):
+
+class _IntArrayMap(Mapping):
+    """
+    Read-only map from the indices of an integer array to its entries. This
+    stands in for a dict with keys 0, ..., n-1 without storing the keys.
+    """
+
+    __slots__ = ("a",)
+
+    def __init__(self, a):
+        self.a = a
+
+    def __getitem__(self, key):
+        # Only the indices of the array are keys. Negative indices and other
+        # types NumPy would accept raise KeyError, as they would for a dict.
+        if isinstance(key, (int, np.integer)) and 0 <= key < len(self.a):
+            return int(self.a[key])
+        raise KeyError(key)
+
+    def __len__(self):
+        return len(self.a)
+
+    def __iter__(self):
+        return iter(range(len(self.a)))
+
+    def items(self):
+        return _IntArrayItems(self)
+
+
+class _IntArrayItems(ItemsView):
+    """
+    Items view of an _IntArrayMap that iterates over the array in one pass
+    rather than looking up each key
+    """
+
+    __slots__ = ()
+
+    def __iter__(self):
+        return enumerate(self._mapping.a.tolist())
+
+
+def _block_edges(target_blocks, source_blocks):
+    """
+    Unique (earlier, later) pairs of blocks joined by an edge of the row
+    graph, given the blocks at both ends of every edge
+    """
+    between = source_blocks != target_blocks
+    return np.unique(
+            np.stack(
+                (target_blocks[between], source_blocks[between]), axis=1),
+            axis=0,
+            )
+
+
+def _topological_block_order(n_blocks, block_edges):
+    """
+    Orders the blocks so that every (earlier, later) pair in block_edges
+    points from a lower to a higher index, using Kahn's algorithm. Returns
+    an array mapping each block to its new index.
+    """
+    successors = [[] for _ in range(n_blocks)]
+    in_degree = [0]*n_blocks
+    for i, j in block_edges.tolist():
+        successors[i].append(j)
+        in_degree[j] += 1
+    order = [b for b in range(n_blocks) if not in_degree[b]]
+    # order grows as blocks lose their last predecessor
+    for b in order:
+        for j in successors[b]:
+            in_degree[j] -= 1
+            if not in_degree[j]:
+                order.append(j)
+    new_label = np.empty(n_blocks, dtype=np.int32)
+    new_label[order] = np.arange(n_blocks, dtype=np.int32)
+    return new_label
+
+
+def _block_triangularize_arrays(indptr, indices, M, col_of_row,
+        build_dag=False):
+    """
+    Block triangularization of a square M-by-M sparsity pattern given as
+    CSC index arrays and a perfect matching, given as an integer array
+    mapping each row index to its matched column index. The inputs are not
+    converted, and the matching is only checked to be a bijection.
+
+    Returns
+    -------
+    Two integer arrays holding the block index of each row and of each
+    column, and the DAG of diagonal blocks or None if build_dag is False.
+    """
+    # Invert the matching to map column indices to row indices
+    row_of_col = np.full(M, -1, dtype=np.int32)
+    row_of_col[col_of_row] = np.arange(M, dtype=np.int32)
+    assert (row_of_col >= 0).all()
+
+    csc = sp.sparse.csc_matrix(
+            (np.ones(len(indices)), indices, indptr), shape=(M, M))
+
+    # Construct directed graph of rows. Column n of row_graph is the matrix
+    # column matched with row n, so it holds an edge towards n from every
+    # row that shares this column. The diagonal only adds self-loops, which
+    # do not change the strongly connected components. Duplicate entries
+    # are merged so each edge is stored once.
+    row_graph = csc[:, col_of_row]
+    row_graph.sum_duplicates()
+
+    # Partition the rows into strongly connected components (diagonal
+    # blocks). In practice SciPy labels the components in the order Tarjan's
+    # algorithm completes them, which is a reverse topological order of the
+    # row graph, so the labels are already the block indices of a
+    # block-lower triangular permutation.
+    n_blocks, labels = connected_components(
+            row_graph, directed=True, connection="strong")
+
+    # Blocks of the row each edge points to and of the row it leaves
+    target_blocks = np.repeat(labels, np.diff(row_graph.indptr))
+    source_blocks = labels[row_graph.indices]
+    if not (source_blocks >= target_blocks).all():
+        # This label order is not documented by SciPy. If it does not hold,
+        # sort the DAG of blocks explicitly and relabel.
+        new_label = _topological_block_order(
+                n_blocks, _block_edges(target_blocks, source_blocks))
+        labels = new_label[labels]
+        target_blocks = new_label[target_blocks]
+        source_blocks = new_label[source_blocks]
+
+    if build_dag:
+        # I now want a DAG of diagonal blocks. Each edge between rows in
+        # different blocks is reversed, so it points from the earlier block
+        # to the later one.
+        dag_ll = [[] for _ in range(n_blocks)]
+        for i, j in _block_edges(target_blocks, source_blocks).tolist():
+            dag_ll[i].append(j)
+    else:
+        dag_ll = None
+
+    return labels, labels[row_of_col], dag_ll
+
+
+def block_triangularize(matrix, matching=None, *, build_dag=False):
     """
     Computes the necessary information to permute a matrix to block-lower
     triangular form, i.e. a partition of rows and columns into an ordered
@@ -23,87 +168,48 @@ def block_triangularize(matrix, matching=None):
     matrix: A SciPy sparse matrix
     matching: A perfect matching of rows and columns, in the form of a dict
               mapping row indices to column indices
+    build_dag: Whether to construct the DAG of diagonal blocks
 
     Returns
     -------
-    Two dicts. The first maps each row index to the index of its block in a
-    block-lower triangular permutation of the matrix. The second maps each
-    column index to the index of its block in a block-lower triangular
-    permutation of the matrix.
+    Two read-only mappings. The first maps each row index to the index of
+    its block in a block-lower triangular permutation of the matrix. The
+    second maps each column index to the index of its block in a
+    block-lower triangular permutation of the matrix. These are followed by
+    the DAG of diagonal blocks as a list of successor lists, or None if
+    build_dag is False.
     """
-    nxb = nx.algorithms.bipartite
-    nxc = nx.algorithms.components
-    nxd = nx.algorithms.dag
-    from_biadjacency_matrix = nxb.matrix.from_biadjacency_matrix
-
     M, N = matrix.shape
     if M != N:
         raise ValueError("block_triangularize does not currently "
            "support non-square matrices. Got matrix with shape %s."
            % (matrix.shape,)
            )
-    bg = from_biadjacency_matrix(matrix)
+    csc = matrix.tocsc()
 
     if matching is None:
-        matching = maximum_matching(matrix)
+        # SciPy's Hopcroft-Karp gives the column matched with each row, or
+        # -1 for an unmatched row
+        col_of_row = maximum_bipartite_matching(
+                matrix.tocsr(), perm_type="column")
+        len_matching = int(np.count_nonzero(col_of_row >= 0))
+    else:
+        len_matching = len(matching)
 
-    len_matching = len(matching)
     if len_matching != M:
         raise ValueError("block_triangularize only supports matrices "
                 "that have a perfect matching of rows and columns. "
                 "Cardinality of maximal matching is %s" % len_matching
                 )
 
-    # Construct directed graph of rows
-    dg = nx.DiGraph()
-    dg.add_nodes_from(range(M))
-    for n in dg.nodes:
-        col_idx = matching[n]
-        col_node = col_idx + M
-        # For all rows that share this column
-        for neighbor in bg[col_node]:
-            if neighbor != n:
-                # Add an edge towards this column's matched row
-                dg.add_edge(neighbor, n)
-
-    # Partition the rows into strongly connected components (diagonal blocks)
-    scc_list = list(nxc.strongly_connected_components(dg))
-    node_scc_map = {n: idx for idx, scc in enumerate(scc_list) for n in scc}
-
-    # Now we need to put the SCCs in the right order. We do this by performing
-    # a topological sort on the DAG of SCCs.
-    dag = nx.DiGraph()
-    for i, c in enumerate(scc_list):
-        dag.add_node(i)
-    for n in dg.nodes:
-        source_scc = node_scc_map[n]
-        for neighbor in dg[n]:
-            # directed graph of constraints
-            target_scc = node_scc_map[neighbor]
-            if target_scc != source_scc:
-                dag.add_edge(target_scc, source_scc)
-                # Reverse direction of edge. This corresponds to creating
-                # a block lower triangular matrix.
-
-    # Indices into the SCC list, permuted into a topological order
-    scc_order = list(nxd.topological_sort(dag))
-
-    # c is the index into the list of SCCs
-    # i is where it belongs in the order
-    scc_block_map = {c: i for i, c in enumerate(scc_order)}
-    row_block_map = {n: scc_block_map[c] for n, c in node_scc_map.items()}
-    # ^ This maps row indices to the blocks they belong to.
-
-    # I now want a DAG of diagonal blocks
-    dag_ll = [
-            [scc_block_map[j] for j in dag[i]]
-            for i in scc_order
-            ]
+    if matching is not None:
+        col_of_row = np.fromiter(
+                (matching[r] for r in range(M)), dtype=np.int32, count=M)
+    row_blocks, col_blocks, dag_ll = _block_triangularize_arrays(
+            csc.indptr, csc.indices, M, col_of_row, build_dag=build_dag)
 
-    # Invert the matching to map row indices to column indices
-    col_row_map = {c: r for r, c in matching.items()}
-    assert len(col_row_map) == M
-
-    col_block_map = {c: row_block_map[col_row_map[c]] for c in range(N)}
+    row_block_map = _IntArrayMap(row_blocks)
+    # ^ This maps row indices to the blocks they belong to.
+    col_block_map = _IntArrayMap(col_blocks)
 
     return row_block_map, col_block_map, dag_ll
@@ -115,7 +115,8 @@ def get_minimal_subsystem_for_variables(system, solve_for):
         Variables that we would like to solve for
     """
     igraph = IncidenceGraphInterface()
-    vb_map, cb_map, dag_ll = igraph.block_triangularize(*system)
+    vb_map, cb_map, dag_ll = igraph.block_triangularize(
+            *system, build_dag=True)
     n_blocks = len(dag_ll)
 
     var_blocks = [[] for b in range(n_blocks)]